@@ -2,22 +2,230 @@
 #!pip install process_spectra
 
 import os
-import sys
+import hashlib
 import json
+import uuid
+import warnings
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
-from scipy.signal import savgol_filter
+from dataclasses import dataclass
+from functools import lru_cache
+from matplotlib.collections import LineCollection
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pyarrow import csv as pacsv, compute as pc, fs as pafs
+from scipy.ndimage import convolve1d
+from scipy.signal import oaconvolve, savgol_coeffs
 from process_spectra.funcs import get_approximate_valley
 
-def ler_multiplos_txt(diretorio,lambda_min=1400,lambda_max=1650):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tamanho aproximado, em bytes, dos blocos de linhas processados de uma vez em `_franjas_lote`.
+_BLOCO_BYTES = 1 << 20
+
+@contextmanager
+def _escrita_atomica(caminho_arquivo):
+    """
+    Fornece um caminho temporário no diretório de `caminho_arquivo` para a escrita.
+
+    O arquivo temporário só substitui `caminho_arquivo`, com `os.replace`, se o bloco
+    terminar sem erro; caso contrário é removido, e um arquivo já existente em
+    `caminho_arquivo` permanece intacto.
+
+    Parameters
+    ----------
+    caminho_arquivo : str
+        Caminho final do arquivo.
+
+    Yields
+    ------
+    str
+        Caminho do arquivo temporário a ser gravado.
+    """
+    diretorio, nome = os.path.split(caminho_arquivo)
+    caminho_tmp = os.path.join(diretorio, f".{nome}.{uuid.uuid4().hex}.tmp")
+    try:
+        yield caminho_tmp
+        os.replace(caminho_tmp, caminho_arquivo)
+    finally:
+        if os.path.exists(caminho_tmp):
+            os.remove(caminho_tmp)
+
+def _ler_txt(caminho_arquivo, lambda_min, lambda_max, dtype):
+    """
+    Lê um único arquivo `.txt` com o leitor CSV do Arrow e filtra por comprimento de onda.
+
+    Se os comprimentos de onda forem estritamente crescentes, os limites da faixa são
+    encontrados por busca binária; caso contrário, é aplicada uma máscara booleana.
+
+    Parameters
+    ----------
+    caminho_arquivo : str
+        Caminho completo para o arquivo `.txt`.
+    lambda_min : float
+        Valor mínimo do comprimento de onda para filtragem.
+    lambda_max : float
+        Valor máximo do comprimento de onda para filtragem.
+    dtype : numpy.dtype
+        Tipo de ponto flutuante da coluna `Level`.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame com as colunas `Wavelength` e `Level` filtradas.
+    """
+    tbl = pacsv.read_csv(caminho_arquivo, parse_options=pacsv.ParseOptions(delimiter=';'))
+    tbl = tbl.rename_columns(['Wavelength', 'Level'] + tbl.column_names[2:])
+    wl = tbl['Wavelength'].to_numpy()
+    if np.all(np.diff(wl) > 0):
+        # Grade monotônica (caso do OSA): a faixa é uma fatia contígua, sem cópia.
+        i0 = np.searchsorted(wl, lambda_min, side='right')
+        i1 = np.searchsorted(wl, lambda_max, side='left')
+        tbl = tbl.slice(i0, max(0, i1 - i0))
+    else:
+        mask = pc.and_(pc.greater(tbl['Wavelength'], lambda_min),
+                       pc.less(tbl['Wavelength'], lambda_max))
+        tbl = tbl.filter(mask)
+    tbl = tbl.set_column(1, 'Level', pc.cast(tbl['Level'], pa.from_numpy_dtype(dtype)))
+    return tbl.to_pandas(zero_copy_only=False)
+
+def _assinatura_cache(entradas, lambda_min, lambda_max, dtype):
+    """
+    Calcula a assinatura do cache de `ler_multiplos_txt` para um conjunto de arquivos.
+
+    A assinatura muda sempre que algum arquivo `.txt` é adicionado, removido ou
+    modificado (nome, tamanho ou data de modificação), ou quando os parâmetros de
+    leitura mudam.
+
+    Parameters
+    ----------
+    entradas : list of os.DirEntry
+        Entradas dos arquivos `.txt` do diretório.
+    lambda_min : float
+        Valor mínimo do comprimento de onda para filtragem.
+    lambda_max : float
+        Valor máximo do comprimento de onda para filtragem.
+    dtype : numpy.dtype
+        Tipo de ponto flutuante da coluna `Level`.
+
+    Returns
+    -------
+    str
+        Assinatura hexadecimal.
+    """
+    arquivos = sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in entradas)
+    chave = repr((arquivos, lambda_min, lambda_max, np.dtype(dtype).str))
+    return hashlib.blake2b(chave.encode(), digest_size=16).hexdigest()
+
+def _ler_cache(caminho_cache, n_arquivos):
+    """
+    Lê o cache Parquet de `ler_multiplos_txt` e o separa em um DataFrame por arquivo.
+
+    Cada DataFrame recebe apenas as colunas do arquivo original, com os mesmos
+    tipos, mesmo que outros arquivos tenham colunas adicionais.
+
+    Parameters
+    ----------
+    caminho_cache : str
+        Caminho do arquivo de cache.
+    n_arquivos : int
+        Número de arquivos `.txt` representados no cache.
+
+    Returns
+    -------
+    list of pd.DataFrame
+        Lista de DataFrames, na mesma ordem da leitura original.
+
+    Raises
+    ------
+    ValueError
+        Se o cache não corresponder ao número de arquivos.
+    """
+    tbl = pq.read_table(caminho_cache, memory_map=True)
+    colunas = json.loads((tbl.schema.metadata or {}).get(b'sensorlytics_columns', b'null'))
+    contagens = np.bincount(tbl['file_id'].to_numpy(), minlength=n_arquivos)
+    if contagens.size != n_arquivos or (colunas is not None and len(colunas) != n_arquivos):
+        raise ValueError(f"O cache {caminho_cache} não corresponde aos arquivos do diretório.")
+    inicios = np.cumsum(contagens) - contagens
+    tbl = tbl.select([nome for nome in tbl.column_names if nome != 'file_id'])
+
+    dfs = []
+    for i, (inicio, n) in enumerate(zip(inicios, contagens)):
+        parte = tbl.slice(inicio, n)
+        if colunas is None:
+            dfs.append(parte.to_pandas())
+            continue
+        tipos = colunas[i]
+        df = parte.select(list(tipos)).to_pandas()
+        if df.dtypes.astype(str).to_dict() != tipos:
+            df = df.astype(tipos)
+        dfs.append(df)
+    return dfs
+
+def _salvar_cache(dfs, caminho_cache):
+    """
+    Grava o cache Parquet de `ler_multiplos_txt`, removendo caches antigos do diretório.
+
+    As colunas e os tipos de cada DataFrame são guardados nos metadados do arquivo,
+    para que `_ler_cache` devolva exatamente os DataFrames originais. O cache é
+    gravado em um arquivo temporário e só recebe o nome final quando completo.
+
+    Parameters
+    ----------
+    dfs : list of pd.DataFrame
+        DataFrames lidos de cada arquivo.
+    caminho_cache : str
+        Caminho do arquivo de cache.
+
+    Returns
+    -------
+    None
+    """
+    diretorio = os.path.dirname(caminho_cache)
+    try:
+        with os.scandir(diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.startswith('.sensorlytics_') and entrada.name.endswith('.parquet'):
+                    os.remove(entrada.path)
+        tabelas = [pa.Table.from_pandas(df, preserve_index=False)
+                   .add_column(0, 'file_id', pa.array(np.full(len(df), i, dtype=np.int32)))
+                   for i, df in enumerate(dfs)]
+        # A promoção do Arrow preenche colunas ausentes com nulos sem alargar o tipo
+        # (int64 continua int64), ao contrário de `pd.concat`.
+        tbl = pa.concat_tables(tabelas, promote_options='permissive')
+        colunas = [df.dtypes.astype(str).to_dict() for df in dfs]
+        tbl = tbl.replace_schema_metadata({b'sensorlytics_columns': json.dumps(colunas).encode()})
+        with _escrita_atomica(caminho_cache) as caminho_tmp:
+            pq.write_table(tbl, caminho_tmp, compression='zstd')
+    except Exception as e:
+        print(f"Erro ao salvar o cache {caminho_cache}: {e}")
+
+def ler_multiplos_txt(diretorio,lambda_min=1400,lambda_max=1650,dtype=np.float32,cache=False):
     """
     Lê múltiplos arquivos `.txt` de um diretório, filtra os dados por comprimento de onda 
     e retorna uma lista de DataFrames.
 
+    Os arquivos são lidos em paralelo com o leitor CSV do Arrow, que libera o GIL
+    durante a leitura e a conversão dos dados. A coluna `Level` é convertida para
+    `float32` por padrão, o que reduz pela metade o volume de dados movido pelos
+    filtros; `Wavelength` é mantida em `float64`.
+
+    Com `cache=True`, o resultado é guardado em um arquivo Parquet oculto
+    (`.sensorlytics_<assinatura>.parquet`) no próprio diretório. Nas chamadas
+    seguintes, se nenhum arquivo `.txt` nem os parâmetros de leitura tiverem mudado,
+    os dados são lidos desse arquivo em vez de processar os `.txt` novamente. Apenas
+    o cache mais recente é mantido no diretório, e um cache ilegível é descartado e
+    refeito a partir dos `.txt`.
+
     Parameters
     ----------
     diretorio : str
@@ -26,34 +234,213 @@ def ler_multiplos_txt(diretorio,lambda_min=1400,lambda_max=1650):
         Valor mínimo do comprimento de onda para filtragem (default: 1400).
     lambda_max : float, optional
         Valor máximo do comprimento de onda para filtragem (default: 1650).
+    dtype : numpy.dtype, optional
+        Tipo de ponto flutuante da coluna `Level` (default: `np.float32`).
+    cache : bool, optional
+        Se deve usar o cache Parquet no diretório (default: False).
 
     Returns
     -------
     list of pd.DataFrame
-        Lista de DataFrames contendo os dados filtrados de cada arquivo.
+        Lista de DataFrames contendo os dados filtrados de cada arquivo, na ordem
+        alfabética dos nomes dos arquivos.
     """
 
-    dfs = [] 
-    
-    for arquivo in os.listdir(diretorio):
-        if arquivo.endswith(".txt"):
-            caminho_arquivo = os.path.join(diretorio, arquivo)
-            df = pd.read_csv(caminho_arquivo, sep=';') 
-            df = df.rename(columns={df.columns[0]: 'Wavelength', df.columns[1]: 'Level'})
-            df = df[(df.Wavelength > lambda_min) & (df.Wavelength < lambda_max)]
-            dfs.append(df)
+    with os.scandir(diretorio) as entradas:
+        entradas = sorted((entrada for entrada in entradas
+                           if entrada.is_file() and entrada.name.endswith(".txt")),
+                          key=lambda entrada: entrada.name)
+    caminhos = [entrada.path for entrada in entradas]
+
+    if cache:
+        assinatura = _assinatura_cache(entradas, lambda_min, lambda_max, dtype)
+        caminho_cache = os.path.join(diretorio, f".sensorlytics_{assinatura}.parquet")
+        if os.path.exists(caminho_cache):
+            try:
+                return _ler_cache(caminho_cache, len(caminhos))
+            except Exception:
+                # Cache ilegível (por exemplo, truncado): é descartado e refeito abaixo.
+                os.remove(caminho_cache)
+
+    with ThreadPoolExecutor() as executor:
+        dfs = list(executor.map(lambda caminho: _ler_txt(caminho, lambda_min, lambda_max, dtype),
+                                caminhos))
+
+    if cache and dfs:
+        _salvar_cache(dfs, caminho_cache)
     
     return dfs
 
+@dataclass
+class Spectra:
+    """
+    Conjunto de espectros que compartilham a mesma grade de comprimentos de onda.
+
+    Os níveis são armazenados em um único bloco contíguo de formato
+    `(n_espectros, n_amostras)`, com o eixo das amostras de cada espectro como
+    dimensão de passo unitário, e os comprimentos de onda são guardados uma única vez.
+
+    Parameters
+    ----------
+    wavelengths : numpy.ndarray
+        Vetor 1D com a grade de comprimentos de onda comum a todos os espectros.
+    levels : numpy.ndarray
+        Array 2D de formato `(n_espectros, n_amostras)` com os níveis de cada espectro.
+        Arrays `float32` são preservados; qualquer outro tipo é convertido para `float64`.
+
+    Example
+    -------
+    >>> spectra = Spectra.from_txt_dir("path/to/directory")
+    >>> franjas = varre_dados(spectra)
+    """
+    wavelengths: np.ndarray
+    levels: np.ndarray
+
+    def __post_init__(self):
+        self.wavelengths = np.ascontiguousarray(self.wavelengths, dtype=np.float64)
+        levels = np.atleast_2d(self.levels)
+        dtype = np.float32 if levels.dtype == np.float32 else np.float64
+        self.levels = np.ascontiguousarray(levels, dtype=dtype)
+        if self.levels.shape[1] != self.wavelengths.size:
+            raise ValueError("O número de amostras de `levels` deve ser igual ao tamanho de `wavelengths`.")
+
+    def __len__(self):
+        return self.levels.shape[0]
+
+    @classmethod
+    def from_dataframes(cls, dataframes, dtype=None):
+        """
+        Cria um `Spectra` a partir de uma lista de DataFrames com colunas `Wavelength` e `Level`.
+
+        A grade do primeiro DataFrame, em ordem crescente, é usada como referência;
+        espectros com grade diferente são ordenados por comprimento de onda e
+        interpolados sobre ela com `np.interp`. Se a grade de um espectro não cobrir
+        toda a referência, um aviso é emitido, pois `np.interp` repete os valores
+        das extremidades fora dela.
+
+        Parameters
+        ----------
+        dataframes : list of pd.DataFrame
+            Lista de DataFrames contendo as colunas `Wavelength` e `Level`.
+        dtype : numpy.dtype, optional
+            Tipo dos níveis. Por padrão, usa o tipo da coluna `Level` do primeiro
+            DataFrame. `float32` é preservado; qualquer outro tipo resulta em `float64`.
+
+        Returns
+        -------
+        Spectra
+            Espectros empilhados sobre a grade comum.
+
+        Raises
+        ------
+        ValueError
+            Se `dataframes` estiver vazia ou se a grade de algum espectro não se
+            sobrepuser à grade de referência.
+        """
+        if len(dataframes) == 0:
+            raise ValueError("A lista de espectros está vazia.")
+
+        def ordenado(df):
+            wl = df['Wavelength'].to_numpy()
+            level = df['Level'].to_numpy()
+            if not np.all(np.diff(wl) > 0):
+                ordem = np.argsort(wl, kind='stable')
+                wl, level = wl[ordem], level[ordem]
+            return wl, level
+
+        wavelengths, _ = ordenado(dataframes[0])
+        if dtype is None:
+            dtype = dataframes[0]['Level'].dtype
+        dtype = np.float32 if np.dtype(dtype) == np.float32 else np.float64
+        levels = np.empty((len(dataframes), wavelengths.size), dtype=dtype)
+        for i, df in enumerate(dataframes):
+            wl, level = ordenado(df)
+            if np.array_equal(wl, wavelengths):
+                levels[i] = level
+            else:
+                if wl.size == 0 or wavelengths.size and (wl[0] > wavelengths[-1] or wl[-1] < wavelengths[0]):
+                    raise ValueError(f"A grade do espectro {i} não se sobrepõe à grade de referência.")
+                if wavelengths.size and (wl[0] > wavelengths[0] or wl[-1] < wavelengths[-1]):
+                    warnings.warn(f"A grade do espectro {i} não cobre toda a grade de referência; "
+                                  "os níveis fora dela repetem os valores das extremidades.",
+                                  stacklevel=2)
+                levels[i] = np.interp(wavelengths, wl, level)
+        return cls(wavelengths, levels)
+
+    @classmethod
+    def from_txt_dir(cls, diretorio, lambda_min=1400, lambda_max=1650, dtype=np.float32):
+        """
+        Lê os arquivos `.txt` de um diretório diretamente para um `Spectra`.
+
+        Parameters
+        ----------
+        diretorio : str
+            Caminho para o diretório contendo os arquivos `.txt`.
+        lambda_min : float, optional
+            Valor mínimo do comprimento de onda para filtragem (default: 1400).
+        lambda_max : float, optional
+            Valor máximo do comprimento de onda para filtragem (default: 1650).
+        dtype : numpy.dtype, optional
+            Tipo de ponto flutuante dos níveis (default: `np.float32`).
+
+        Returns
+        -------
+        Spectra
+            Espectros lidos e empilhados sobre a grade comum.
+
+        Raises
+        ------
+        ValueError
+            Se o diretório não contiver arquivos `.txt`.
+        """
+        dataframes = ler_multiplos_txt(diretorio, lambda_min, lambda_max, dtype)
+        if not dataframes:
+            raise ValueError(f"Nenhum arquivo .txt encontrado em '{diretorio}'.")
+        return cls.from_dataframes(dataframes)
+
+    def to_dataframes(self):
+        """
+        Converte os espectros de volta para uma lista de DataFrames.
+
+        Returns
+        -------
+        list of pd.DataFrame
+            Lista de DataFrames com as colunas `Wavelength` e `Level`.
+        """
+        return [pd.DataFrame({'Wavelength': self.wavelengths, 'Level': level})
+                for level in self.levels]
+
+def _mesma_grade(dataframes):
+    """
+    Verifica se todos os DataFrames compartilham a mesma grade de comprimentos de onda.
+
+    Parameters
+    ----------
+    dataframes : list of pd.DataFrame
+        Lista de DataFrames contendo a coluna `Wavelength`.
+
+    Returns
+    -------
+    bool
+        `True` se todas as colunas `Wavelength` forem idênticas.
+    """
+    if len(dataframes) == 0:
+        return False
+    referencia = dataframes[0]['Wavelength'].to_numpy()
+    return all(np.array_equal(df['Wavelength'].to_numpy(), referencia) for df in dataframes[1:])
+
 def plotar_dfs(dataframes):
     """
     Plota os dados de uma lista de DataFrames contendo colunas `Wavelength` e `Level`.
 
+    Quando todos os espectros compartilham a mesma grade de comprimentos de onda,
+    eles são desenhados com uma única chamada a `ax.plot` sobre um array 2D.
+
     Parameters
     ----------
-    dataframes : list of pd.DataFrame
+    dataframes : list of pd.DataFrame or Spectra
         Lista de DataFrames a serem plotados. Cada DataFrame deve conter as colunas
-        'Wavelength' e 'Level'.
+        'Wavelength' e 'Level'. Também aceita um objeto `Spectra`.
 
     Returns
     -------
@@ -65,8 +452,14 @@ def plotar_dfs(dataframes):
     
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    for i, df in enumerate(dataframes):
-        ax.plot(df['Wavelength'], df['Level'])
+    if not isinstance(dataframes, Spectra) and _mesma_grade(dataframes):
+        dataframes = Spectra.from_dataframes(dataframes)
+
+    if isinstance(dataframes, Spectra):
+        ax.plot(dataframes.wavelengths, dataframes.levels.T)
+    else:
+        for i, df in enumerate(dataframes):
+            ax.plot(df['Wavelength'], df['Level'])
     
     ax.set_xlabel('Wavelength', fontsize=12)
     ax.set_ylabel('Level', fontsize=12)
@@ -76,14 +469,124 @@ def plotar_dfs(dataframes):
     plt.tight_layout()
     plt.show()
     
-def get_mean(level):
+@lru_cache(maxsize=None)
+def _sg_kernel(janela, ordem):
+    """
+    Retorna os coeficientes de suavização de Savitzky-Golay, calculados uma única vez
+    para cada par `(janela, ordem)`.
+
+    Parameters
+    ----------
+    janela : int
+        Tamanho (ímpar) da janela do filtro.
+    ordem : int
+        Ordem do polinômio ajustado.
+
+    Returns
+    -------
+    numpy.ndarray
+        Coeficientes do filtro (somente leitura), no formato usado em convoluções.
+    """
+    kernel = savgol_coeffs(janela, ordem)
+    kernel.flags.writeable = False
+    return kernel
+
+@lru_cache(maxsize=None)
+def _baseline_matrices(janela, ordem, dtype):
+    """
+    Retorna as matrizes do ajuste polinomial de mínimos quadrados usado nas bordas
+    de `_savgol_interp`, calculadas uma única vez para cada `(janela, ordem, dtype)`.
+
+    Com `V = [1, x, x², ...]` sobre `x = linspace(-1, 1, janela)`, os coeficientes do
+    ajuste de uma janela `y` são `y @ pinv(V).T` e os valores ajustados nas posições
+    de borda são esses coeficientes multiplicados pelas linhas correspondentes de `V`.
+    Assim, as bordas de um lote inteiro de espectros se reduzem a dois produtos
+    matriciais (BLAS).
+
+    Parameters
+    ----------
+    janela : int
+        Tamanho (ímpar) da janela do filtro.
+    ordem : int
+        Ordem do polinômio ajustado.
+    dtype : numpy.dtype
+        Tipo de ponto flutuante das matrizes.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        - `pinv(V).T`, de formato `(janela, ordem + 1)`.
+        - `V` transposta nas posições da borda esquerda, de formato `(ordem + 1, janela // 2)`.
+        - `V` transposta nas posições da borda direita, de formato `(ordem + 1, janela // 2)`.
+    """
+    meio = janela // 2
+    x = np.linspace(-1, 1, janela)
+    V = np.polynomial.polynomial.polyvander(x, ordem)
+    matrizes = (np.linalg.pinv(V).T, V[:meio].T, V[janela - meio:].T)
+    matrizes = tuple(np.ascontiguousarray(m, dtype=dtype) for m in matrizes)
+    for m in matrizes:
+        m.flags.writeable = False
+    return matrizes
+
+def _savgol_interp(level, janela, ordem, out=None):
+    """
+    Aplica o filtro de Savitzky-Golay ao longo do último eixo.
+
+    Produz o mesmo resultado de `savgol_filter(level, janela, ordem)` (modo 'interp'),
+    reaproveitando os coeficientes em cache de `_sg_kernel`. Para janelas longas evita
+    a convolução direta O(N·janela): o interior é obtido por uma convolução via FFT.
+    As bordas são obtidas por um ajuste polinomial de mínimos quadrados, aplicado
+    com as matrizes em cache de `_baseline_matrices`.
+
+    Parameters
+    ----------
+    level : numpy.ndarray
+        Array de níveis, filtrado ao longo do último eixo. Entradas `float32` são
+        processadas e devolvidas em `float32`.
+    janela : int
+        Tamanho (ímpar) da janela do filtro.
+    ordem : int
+        Ordem do polinômio ajustado.
+    out : numpy.ndarray, optional
+        Array de saída, com o mesmo formato de `level`, onde o resultado é escrito
+        diretamente. Não pode compartilhar memória com `level`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array suavizado com o mesmo formato de `level`.
+    """
+    n = level.shape[-1]
+    if janela > n:
+        raise ValueError("O tamanho da janela não pode ser maior que o número de amostras.")
+    meio = janela // 2
+    dtype = np.float32 if level.dtype == np.float32 else np.float64
+    kernel = _sg_kernel(janela, ordem).astype(dtype)
+
+    saida = np.empty(level.shape, dtype=dtype) if out is None else out
+    # Janelas curtas: a convolução direta é mais barata que a FFT.
+    if janela <= 101:
+        convolve1d(level.astype(dtype, copy=False), kernel, axis=-1, output=saida, mode='constant')
+    else:
+        kernel = kernel.reshape((1,) * (level.ndim - 1) + (janela,))
+        saida[..., meio:n - meio] = oaconvolve(level, kernel, mode='valid', axes=-1)
+
+    C_T, V_esq, V_dir = _baseline_matrices(janela, ordem, np.dtype(dtype))
+    saida[..., :meio] = (level[..., :janela] @ C_T) @ V_esq
+    saida[..., n - meio:] = (level[..., n - janela:] @ C_T) @ V_dir
+    return saida
+
+def get_mean(level, axis=-1):
     """
     Calcula a média suavizada de uma série de níveis utilizando o filtro de Savitzky-Golay.
 
     Parameters
     ----------
     level : array-like
-        Série de valores de nível para cálculo da média suavizada.
+        Série de valores de nível para cálculo da média suavizada. Pode ser um
+        array 2D contendo vários espectros de mesmo comprimento.
+    axis : int, optional
+        Eixo ao longo do qual o filtro é aplicado (default: -1).
 
     Returns
     -------
@@ -91,37 +594,88 @@ def get_mean(level):
         Série suavizada dos níveis.
     """
 
-    wind = len(level)/1.1
+    level = np.asarray(level)
+    wind = level.shape[axis]/1.1
     wind = int(np.floor(wind))
     wind = wind + wind%2 + 1
-    return savgol_filter(level, wind, 2)
+    mean = _savgol_interp(np.moveaxis(level, axis, -1), wind, 2)
+    return np.moveaxis(mean, -1, axis)
+
+def _franjas_lote(levels, out):
+    """
+    Calcula as franjas de um lote 2D de espectros, bloco a bloco.
+
+    Para cada bloco de linhas, a média suavizada é calculada, subtraída no próprio
+    buffer da média e a suavização final é escrita diretamente em `out`. Os blocos
+    têm cerca de `_BLOCO_BYTES` bytes, de modo que os dados intermediários
+    permanecem em cache entre as etapas e nenhum temporário do tamanho do lote
+    inteiro é alocado. Como as convoluções (FFT do SciPy e `ndimage.convolve1d`)
+    liberam o GIL, os blocos são processados em paralelo por threads.
 
-def get_fringe(level):
+    Parameters
+    ----------
+    levels : numpy.ndarray
+        Array 2D de formato `(n_espectros, n_amostras)`.
+    out : numpy.ndarray
+        Array de saída com o mesmo formato de `levels`.
+
+    Returns
+    -------
+    numpy.ndarray
+        O próprio `out`, preenchido com as franjas.
+    """
+    linhas = max(1, _BLOCO_BYTES // (levels.shape[1] * out.itemsize))
+    blocos = [slice(inicio, inicio + linhas) for inicio in range(0, levels.shape[0], linhas)]
+
+    def processa(bloco):
+        media = get_mean(levels[bloco])
+        np.subtract(levels[bloco], media, out=media)
+        _savgol_interp(media, 11, 2, out=out[bloco])
+
+    n_threads = min(len(blocos), os.cpu_count() or 1)
+    if n_threads > 1:
+        with ThreadPoolExecutor(n_threads) as executor:
+            list(executor.map(processa, blocos))
+    else:
+        for bloco in blocos:
+            processa(bloco)
+    return out
+
+def get_fringe(level, axis=-1):
     """
     Calcula as franjas de visibilidade subtraindo a média suavizada de uma série de níveis.
 
     Parameters
     ----------
     level : array-like
-        Série de valores de nível.
+        Série de valores de nível. Pode ser um array 2D contendo vários
+        espectros de mesmo comprimento.
+    axis : int, optional
+        Eixo ao longo do qual o filtro é aplicado (default: -1).
 
     Returns
     -------
     numpy.ndarray
         Série de franjas de visibilidade suavizadas.
     """
-    fringe = level-get_mean(level)
-    fringe = savgol_filter(fringe, 11, 2)
-    return fringe
+    level = np.moveaxis(np.asarray(level), axis, -1)
+    linhas = level.reshape(-1, level.shape[-1])
+    fringe = np.empty(linhas.shape, dtype=np.float32 if level.dtype == np.float32 else np.float64)
+    _franjas_lote(linhas, fringe)
+    return np.moveaxis(fringe.reshape(level.shape), -1, axis)
 
 def varre_dados_plot(dados_amostra,color='r'):
     """
     Calcula as franjas de visibilidade para cada DataFrame na lista e plota os resultados.
 
+    Todas as franjas são desenhadas de uma só vez, como uma única `LineCollection`
+    adicionada aos eixos atuais.
+
     Parameters
     ----------
-    dados_amostra : list of pd.DataFrame
-        Lista de DataFrames contendo as colunas `Wavelength` e `Level`.
+    dados_amostra : list of pd.DataFrame or Spectra
+        Lista de DataFrames contendo as colunas `Wavelength` e `Level`, ou um
+        objeto `Spectra`.
     color : str, optional
         Cor da linha do gráfico (default: 'r').
 
@@ -130,14 +684,18 @@ def varre_dados_plot(dados_amostra,color='r'):
     None
         Exibe os gráficos das franjas de visibilidade.
     """
-    Franjas_media = []
-    for i, x in enumerate(dados_amostra):
-        wl = dados_amostra[i].Wavelength
-        level = dados_amostra[i].Level
-        x_m = get_fringe(level)
-        plt.plot(wl, x_m, color=color)
-        Franjas_media.append(x_m)
-    Franjas_media = np.array(Franjas_media)
+    Franjas_media = varre_dados(dados_amostra)
+    if isinstance(dados_amostra, Spectra):
+        segmentos = np.empty(Franjas_media.shape + (2,))
+        segmentos[..., 0] = dados_amostra.wavelengths
+        segmentos[..., 1] = Franjas_media
+    else:
+        segmentos = [np.column_stack([df['Wavelength'].to_numpy(), x_m])
+                     for df, x_m in zip(dados_amostra, Franjas_media)]
+    ax = plt.gca()
+    ax.add_collection(LineCollection(segmentos, colors=color,
+                                     linewidths=plt.rcParams['lines.linewidth']))
+    ax.autoscale_view()
         
 def varre_dados(dados_amostra):
     """
@@ -145,23 +703,60 @@ def varre_dados(dados_amostra):
 
     Parameters
     ----------
-    dados_amostra : list of pd.DataFrame
-        Lista de DataFrames contendo as colunas `Wavelength` e `Level`.
+    dados_amostra : list of pd.DataFrame or Spectra
+        Lista de DataFrames contendo as colunas `Wavelength` e `Level`, ou um
+        objeto `Spectra`.
 
     Returns
     -------
     numpy.ndarray
-        Array contendo as franjas de visibilidade para cada amostra.
-    """
-    Franjas_media = []
-    for i, x in enumerate(dados_amostra):
-        wl = dados_amostra[i].Wavelength
-        level = dados_amostra[i].Level
-        x_m = get_fringe(level)
-        Franjas_media.append(x_m)
-    Franjas_media = np.array(Franjas_media)
+        Array 2D de formato `(n_espectros, n_amostras)` contendo as franjas de
+        visibilidade para cada amostra. Uma lista vazia resulta em um array vazio.
+
+    Notes
+    -----
+    Todos os espectros devem compartilhar a mesma grade de comprimentos de onda
+    (caso típico de uma varredura do OSA), pois os níveis são empilhados em um
+    único array e filtrados de uma só vez.
+    """
+    if isinstance(dados_amostra, Spectra):
+        levels = dados_amostra.levels
+    elif len(dados_amostra) == 0:
+        return np.array([])
+    else:
+        levels = np.stack([df['Level'].to_numpy() for df in dados_amostra])
+    Franjas_media = get_fringe(levels, axis=1)
     return(Franjas_media)
 
+def _dump_json(data, caminho_arquivo):
+    """
+    Grava dados em um arquivo JSON compacto, usando `orjson` quando disponível.
+
+    Com `orjson`, arrays e escalares NumPy são serializados diretamente; sem ele,
+    usa o módulo `json` da biblioteca padrão.
+
+    Valores não finitos dependem do serializador: `orjson` grava NaN e ±inf como
+    `null`, seguindo o padrão JSON, enquanto `json` grava `NaN`/`Infinity`. Ambos
+    os formatos são lidos por `load_json_file`.
+
+    Parameters
+    ----------
+    data : object
+        Dados serializáveis em JSON.
+    caminho_arquivo : str
+        Caminho do arquivo de destino.
+
+    Returns
+    -------
+    None
+    """
+    if orjson is not None:
+        with open(caminho_arquivo, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(caminho_arquivo, 'w') as f:
+            json.dump(data, f)
+
 def save_list_to_json(data, filename):
     """
     Salva dados processados em um arquivo JSON.
@@ -178,14 +773,17 @@ def save_list_to_json(data, filename):
     -------
     None
         Salva o arquivo JSON no local especificado e exibe uma mensagem de confirmação.
+
+    Notes
+    -----
+    Com `orjson` instalado, valores NaN e ±inf são gravados como `null`.
     """
     if hasattr(data, "to_dict"):
         data_dict = {"data": data.to_dict(orient="records")}
     else:
         data_dict = {"data": data}
 
-    with open(filename, "w") as f:
-        json.dump(data_dict, f)
+    _dump_json(data_dict, filename)
     print(f"Arquivo JSON '{filename}' salvo com sucesso.")
     
 def load_json_file(file_path):
@@ -202,9 +800,16 @@ def load_json_file(file_path):
     dict
         Dados carregados do arquivo JSON em formato de dicionário.
     """
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    return data
+    with open(file_path, 'rb') as f:
+        conteudo = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(conteudo)
+        except orjson.JSONDecodeError:
+            # Arquivos gravados com `json` podem conter NaN/Infinity, que o
+            # `orjson` rejeita.
+            pass
+    return json.loads(conteudo)
 
 def dict_to_vector(dictionary):
     """
@@ -241,16 +846,256 @@ def salvar_espectros(lista_dataframes, nome_arquivo, pasta_destino):
     -------
     None
         Salva o arquivo JSON no local especificado e exibe uma mensagem de confirmação.
+
+    Notes
+    -----
+    Com `orjson` instalado, valores NaN e ±inf são gravados como `null`.
     """
     os.makedirs(pasta_destino, exist_ok=True)
     caminho_arquivo = os.path.join(pasta_destino, nome_arquivo)
     lista_dicionarios = [df.to_dict(orient='records') for df in lista_dataframes]
 
-    with open(caminho_arquivo, 'w') as outfile:
-        json.dump(lista_dicionarios, outfile, indent=4)
+    _dump_json(lista_dicionarios, caminho_arquivo)
     
     print(f"Arquivo JSON salvo com sucesso em: {caminho_arquivo}")
     
+def salvar_espectros_parquet(lista_dataframes, nome_arquivo, pasta_destino):
+    """
+    Salva uma lista de DataFrames de espectros em um único arquivo Parquet.
+
+    Os espectros são concatenados em uma única tabela com a coluna adicional
+    `spectrum_id`, comprimida com ZSTD e gravada com exatamente um row group por
+    espectro não vazio, o que permite a leitura incremental com `load_spectra_parquet`
+    e a seleção de espectros por row group em `load_spectra`. O número de
+    espectros é guardado nos metadados do arquivo, de modo que espectros vazios
+    também são recuperados na leitura.
+
+    Parameters
+    ----------
+    lista_dataframes : list of pd.DataFrame
+        Lista de DataFrames a serem salvos.
+    nome_arquivo : str
+        Nome do arquivo Parquet (com extensão .parquet).
+    pasta_destino : str
+        Caminho da pasta onde o arquivo será salvo.
+
+    Returns
+    -------
+    None
+        Salva o arquivo Parquet no local especificado e exibe uma mensagem de confirmação.
+
+    Raises
+    ------
+    ValueError
+        Se `lista_dataframes` estiver vazia.
+
+    Example
+    -------
+    >>> salvar_espectros_parquet(dados_amostra, 'espectros.parquet', './dados')
+    """
+    if len(lista_dataframes) == 0:
+        raise ValueError("A lista de espectros está vazia.")
+
+    os.makedirs(pasta_destino, exist_ok=True)
+    caminho_arquivo = os.path.join(pasta_destino, nome_arquivo)
+    df = pd.concat(lista_dataframes, keys=range(len(lista_dataframes)), names=['spectrum_id'])
+    df = df.reset_index(level='spectrum_id')
+    tbl = pa.Table.from_pandas(df, preserve_index=False)
+    metadados = dict(tbl.schema.metadata or {})
+    metadados[b'sensorlytics_n_spectra'] = str(len(lista_dataframes)).encode()
+    tbl = tbl.replace_schema_metadata(metadados)
+    # Cada espectro não vazio é gravado em uma chamada própria, formando exatamente
+    # um row group, de modo que nenhum row group mistura espectros.
+    with pq.ParquetWriter(caminho_arquivo, tbl.schema, compression='zstd') as writer:
+        inicio = 0
+        for espectro in lista_dataframes:
+            if len(espectro):
+                writer.write_table(tbl.slice(inicio, len(espectro)), row_group_size=len(espectro))
+            inicio += len(espectro)
+
+    print(f"Arquivo Parquet salvo com sucesso em: {caminho_arquivo}")
+
+def _info_espectros(schema, ids_lidos):
+    """
+    Obtém, a partir do esquema de um arquivo de `salvar_espectros_parquet`, o número
+    de espectros salvos e um DataFrame vazio para representar espectros sem linhas.
+
+    Parameters
+    ----------
+    schema : pyarrow.Schema
+        Esquema do arquivo Parquet.
+    ids_lidos : iterable of int
+        Identificadores dos espectros encontrados na leitura, usados caso o arquivo
+        não contenha o número de espectros nos metadados.
+
+    Returns
+    -------
+    tuple of (int, pd.DataFrame)
+        O número de espectros e um DataFrame vazio com as colunas dos espectros.
+    """
+    metadados = schema.metadata or {}
+    if b'sensorlytics_n_spectra' in metadados:
+        n_espectros = int(metadados[b'sensorlytics_n_spectra'])
+    else:
+        n_espectros = max(ids_lidos, default=-1) + 1
+    vazio = schema.empty_table().to_pandas().drop(columns='spectrum_id')
+    return n_espectros, vazio
+
+def load_spectra_parquet(file_path, batch_size=None):
+    """
+    Carrega uma lista de espectros salva com `salvar_espectros_parquet`.
+
+    O arquivo é lido em lotes com `ParquetFile.iter_batches` e convertido para pandas
+    lote a lote, evitando manter ao mesmo tempo a tabela Arrow completa e sua cópia
+    em pandas. A lista retornada, porém, contém todos os espectros na memória; para
+    percorrer arquivos grandes sem carregá-los inteiros, use `iter_spectra`.
+
+    Parameters
+    ----------
+    file_path : str
+        Caminho completo para o arquivo Parquet.
+    batch_size : int, optional
+        Número de linhas lidas por lote. Por padrão, usa o tamanho do primeiro
+        row group (um espectro).
+
+    Returns
+    -------
+    list of pd.DataFrame
+        Lista de DataFrames, um para cada `spectrum_id`, na ordem em que foram salvos
+        (incluindo espectros vazios).
+    """
+    arquivo = pq.ParquetFile(file_path)
+    if batch_size is None:
+        batch_size = arquivo.metadata.row_group(0).num_rows if arquivo.num_row_groups else 0
+        batch_size = max(1, batch_size)
+
+    partes = {}
+    for batch in arquivo.iter_batches(batch_size=batch_size):
+        df = batch.to_pandas()
+        for spectrum_id, grupo in df.groupby('spectrum_id', sort=False):
+            partes.setdefault(spectrum_id, []).append(grupo.drop(columns='spectrum_id'))
+
+    n_espectros, vazio = _info_espectros(arquivo.schema_arrow, partes)
+    return [pd.concat(partes[i], ignore_index=True) if i in partes else vazio.copy()
+            for i in range(n_espectros)]
+
+def _scan_spectra(file_path, columns, spectrum_ids):
+    """
+    Prepara a leitura de um arquivo de `salvar_espectros_parquet` com `pyarrow.dataset`.
+
+    O arquivo é aberto com memória mapeada, e a seleção de colunas e o filtro por
+    `spectrum_id` são empurrados para o leitor Parquet. Como cada row group contém um
+    espectro, os row groups não selecionados nem chegam a ser descomprimidos.
+
+    Parameters
+    ----------
+    file_path : str
+        Caminho completo para o arquivo Parquet.
+    columns : list of str or None
+        Colunas a serem lidas, além de `spectrum_id`. Com `None`, lê todas.
+    spectrum_ids : iterable of int or None
+        Identificadores dos espectros a serem lidos. Com `None`, lê todos.
+
+    Returns
+    -------
+    tuple of (pyarrow.dataset.Dataset, list of str or None, pyarrow.dataset.Expression or None)
+        O dataset, as colunas a projetar e o filtro.
+    """
+    dataset = ds.dataset(file_path, format='parquet', filesystem=pafs.LocalFileSystem(use_mmap=True))
+    if columns is not None:
+        columns = ['spectrum_id'] + [c for c in columns if c != 'spectrum_id']
+    filtro = None
+    if spectrum_ids is not None:
+        filtro = ds.field('spectrum_id').isin(list(spectrum_ids))
+    return dataset, columns, filtro
+
+def load_spectra(file_path, columns=None, spectrum_ids=None):
+    """
+    Carrega apenas as colunas e os espectros desejados de um arquivo de `salvar_espectros_parquet`.
+
+    Parameters
+    ----------
+    file_path : str
+        Caminho completo para o arquivo Parquet.
+    columns : list of str, optional
+        Colunas a serem lidas (por exemplo, `['Level']`). Por padrão, lê todas.
+    spectrum_ids : iterable of int, optional
+        Identificadores dos espectros a serem lidos. Por padrão, lê todos.
+
+    Returns
+    -------
+    list of pd.DataFrame
+        Lista com um DataFrame para cada identificador, na ordem de `spectrum_ids`
+        (ou de todos os espectros do arquivo, por padrão), de modo que a posição `k`
+        corresponde ao `k`-ésimo identificador. Espectros vazios, e identificadores
+        ausentes do arquivo, resultam em DataFrames vazios com as colunas lidas.
+
+    Example
+    -------
+    >>> dfs = load_spectra('./dados/espectros.parquet', columns=['Level'], spectrum_ids=[0, 5])
+    """
+    if spectrum_ids is not None:
+        spectrum_ids = [int(spectrum_id) for spectrum_id in spectrum_ids]
+    dataset, columns, filtro = _scan_spectra(file_path, columns, spectrum_ids)
+    tbl = dataset.to_table(columns=columns, filter=filtro)
+    ids = tbl['spectrum_id'].to_numpy()
+    if np.any(np.diff(ids) < 0):
+        tbl = tbl.sort_by('spectrum_id')
+        ids = tbl['spectrum_id'].to_numpy()
+
+    limites = np.concatenate([[0], np.flatnonzero(np.diff(ids)) + 1, [ids.size]])
+    tbl = tbl.select([nome for nome in tbl.column_names if nome != 'spectrum_id'])
+    encontrados = {int(ids[inicio]): tbl.slice(inicio, fim - inicio).to_pandas()
+                   for inicio, fim in zip(limites[:-1], limites[1:]) if fim > inicio}
+
+    n_espectros, vazio = _info_espectros(dataset.schema, encontrados)
+    vazio = vazio[tbl.column_names]
+    if spectrum_ids is None:
+        spectrum_ids = range(n_espectros)
+    return [encontrados[i] if i in encontrados else vazio.copy() for i in spectrum_ids]
+
+def iter_spectra(file_path, columns=None, spectrum_ids=None):
+    """
+    Percorre os espectros de um arquivo de `salvar_espectros_parquet` um a um.
+
+    Os dados são lidos em lotes com `Dataset.to_batches`, de modo que apenas o
+    espectro atual é mantido na memória. Apenas espectros com linhas são produzidos:
+    espectros vazios e identificadores ausentes do arquivo são omitidos, e os
+    espectros saem em ordem de `spectrum_id`. Para obter uma entrada por
+    identificador, use `load_spectra`.
+
+    Parameters
+    ----------
+    file_path : str
+        Caminho completo para o arquivo Parquet.
+    columns : list of str, optional
+        Colunas a serem lidas (por exemplo, `['Level']`). Por padrão, lê todas.
+    spectrum_ids : iterable of int, optional
+        Identificadores dos espectros a serem lidos. Por padrão, lê todos.
+
+    Yields
+    ------
+    tuple of (int, pd.DataFrame)
+        O `spectrum_id` e o DataFrame do espectro correspondente.
+
+    Example
+    -------
+    >>> for spectrum_id, df in iter_spectra('./dados/espectros.parquet', columns=['Level']):
+    ...     print(spectrum_id, df['Level'].min())
+    """
+    dataset, columns, filtro = _scan_spectra(file_path, columns, spectrum_ids)
+    atual, partes = None, []
+    for batch in dataset.to_batches(columns=columns, filter=filtro, use_threads=False):
+        df = batch.to_pandas()
+        for spectrum_id, grupo in df.groupby('spectrum_id', sort=False):
+            if spectrum_id != atual and partes:
+                yield atual, pd.concat(partes, ignore_index=True)
+                partes = []
+            atual = spectrum_id
+            partes.append(grupo.drop(columns='spectrum_id'))
+    if partes:
+        yield atual, pd.concat(partes, ignore_index=True)
+
 def list_dict_to_list_df(list_dict):
     """
     Converte uma lista de dicionários em uma lista de DataFrames.
@@ -289,12 +1134,14 @@ def cria_franjas(specs_experimento):
     Gera as franjas para todos os espectros de um experimento.
 
     Aplica a função `varre_dados` para uma lista contendo listas de DataFrames
-    representando os espectros de cada amostra.
+    representando os espectros de cada amostra. O array de saída é alocado uma
+    única vez e preenchido por fatias.
 
     Parameters
     ----------
-    specs_experimento : list of list of pd.DataFrame
-        Lista contendo as listas de DataFrames de espectros para cada amostra.
+    specs_experimento : list of list of pd.DataFrame or list of Spectra
+        Lista contendo as listas de DataFrames (ou objetos `Spectra`) de espectros
+        para cada amostra.
 
     Returns
     -------
@@ -307,64 +1154,151 @@ def cria_franjas(specs_experimento):
     >>> specs_dia_2 = [spec_1_dia_2, spec_2_dia_2]
     >>> franjas, len_franjas = cria_franjas(specs_dia_2)
     """
-    franjas = []  
-    len_franjas = []  
-    for spec in specs_experimento:
-        franjas_spec = np.array(varre_dados(spec))
-        len_spec = (len(franjas_spec))
-        len_franjas.append(len_spec)
-        franjas.extend(franjas_spec)
-    return np.array(franjas), len_franjas
+    len_franjas = [len(spec) for spec in specs_experimento]
+    franjas = np.empty((0,))
+    offset = 0
+    for i, spec in enumerate(specs_experimento):
+        if len_franjas[i] == 0:
+            continue
+        franjas_spec = varre_dados(spec)
+        if offset == 0:
+            franjas = np.empty((sum(len_franjas),) + franjas_spec.shape[1:], dtype=franjas_spec.dtype)
+        franjas[offset:offset + len_franjas[i]] = franjas_spec
+        offset += len_franjas[i]
+    return franjas, len_franjas
+
+def _find_valley(spec):
+    """
+    Calcula o comprimento de onda ressonante de um único espectro.
+
+    Parameters
+    ----------
+    spec : numpy.ndarray
+        Array de formato `(N, 2)` com os comprimentos de onda na primeira coluna
+        e os níveis na segunda.
+
+    Returns
+    -------
+    float
+        Comprimento de onda ressonante do vale de maior proeminência.
+    """
+    spec, info = get_approximate_valley(spec, {}, prominence=0.5)
+    i = info['best_index']
+    return info[f'resonant_wl_{i}']
+
+def _find_valleys(specs):
+    """
+    Calcula os comprimentos de onda ressonantes de um grupo de espectros.
+
+    Função de nível de módulo para poder ser enviada aos processos de
+    `calcular_wl_res_list`. A saída impressa por `get_approximate_valley` é
+    descartada em `os.devnull` com `redirect_stdout`, sem alterar o `sys.stdout`
+    global; o arquivo é fechado mesmo que o ajuste de algum espectro falhe.
+
+    Parameters
+    ----------
+    specs : sequence of numpy.ndarray
+        Espectros no formato `(N, 2)`.
+
+    Returns
+    -------
+    list of float
+        Comprimentos de onda ressonantes, na ordem dos espectros.
+    """
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        return [_find_valley(spec) for spec in specs]
 
-def calcular_wl_res_list(dados_amostra):
+def calcular_wl_res_list(dados_amostra, n_processos=None):
     """
     Calcula a lista de comprimentos de onda ressonantes para os espectros fornecidos.
 
     Utiliza a função `get_approximate_valley` para determinar os valores ressonantes
-    de comprimento de onda para cada DataFrame em `dados_amostra`.
+    de comprimento de onda para cada DataFrame em `dados_amostra`. Os espectros são
+    independentes entre si e são distribuídos entre processos com `ProcessPoolExecutor`.
 
     Parameters
     ----------
-    dados_amostra : list of pd.DataFrame
-        Lista de DataFrames contendo os espectros com colunas `Wavelength` e `Level`.
+    dados_amostra : list of pd.DataFrame or Spectra
+        Lista de DataFrames contendo os espectros com colunas `Wavelength` e `Level`,
+        ou um objeto `Spectra`.
+    n_processos : int, optional
+        Número de processos utilizados, limitado ao número de espectros. Por padrão,
+        usa todos os núcleos disponíveis; com `1`, ou com até um espectro, o cálculo
+        é feito no processo atual.
 
     Returns
     -------
     list of float
         Lista de valores de comprimento de onda ressonantes calculados.
 
+    Raises
+    ------
+    ValueError
+        Se `n_processos` for menor que 1.
+
+    Notes
+    -----
+    Em sistemas que iniciam processos por `spawn` (Windows e macOS), a chamada
+    deve estar protegida por `if __name__ == "__main__":` no script principal.
+
     Example
     -------
     >>> dados_amostra = [df1, df2]
     >>> wl_res_list = calcular_wl_res_list(dados_amostra)
     """
-    stdout_temp = sys.stdout
-    sys.stdout = open(os.devnull, 'w')
-    wl_res_list = []
-    for df in dados_amostra:
-        spec = np.array([df['Wavelength'].values, df['Level'].values])
-        spec, info = get_approximate_valley(spec.T, {}, prominence=0.5)
-        i = info['best_index']
-        wl_res = info[f'resonant_wl_{i}']
-        wl_res_list.append(wl_res)
-    sys.stdout = stdout_temp
+    if n_processos is not None and n_processos < 1:
+        raise ValueError("`n_processos` deve ser um inteiro maior ou igual a 1.")
+
+    # Monta cada espectro diretamente no formato contíguo (N, 2) esperado por
+    # `get_approximate_valley`; para um `Spectra`, todos em um único buffer.
+    if isinstance(dados_amostra, Spectra):
+        specs = np.empty(dados_amostra.levels.shape + (2,), dtype=np.float64)
+        specs[:, :, 0] = dados_amostra.wavelengths
+        specs[:, :, 1] = dados_amostra.levels
+    else:
+        specs = []
+        for df in dados_amostra:
+            spec = np.empty((len(df), 2), dtype=np.float64)
+            spec[:, 0] = df['Wavelength'].to_numpy()
+            spec[:, 1] = df['Level'].to_numpy()
+            specs.append(spec)
+
+    n_workers = min(n_processos or os.cpu_count() or 1, len(specs))
+    if n_workers <= 1:
+        return _find_valleys(specs)
+
+    chunksize = max(1, len(specs) // (4 * n_workers))
+    grupos = [specs[i:i + chunksize] for i in range(0, len(specs), chunksize)]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        wl_res_list = [wl_res for grupo in executor.map(_find_valleys, grupos) for wl_res in grupo]
 
     return wl_res_list
 
 
-def find_pdf(data):
+def find_pdf(data, resolution=None):
     """
     Calcula a PDF (Probabilidade de Densidade) para os valores únicos em um conjunto de dados.
 
+    Valores inteiros, incluindo floats de valor inteiro, são contados diretamente
+    com `np.bincount`, em tempo linear. Os demais dados de ponto flutuante são
+    comparados exatamente, a menos que `resolution` seja informado: nesse caso são
+    antes quantizados nesse passo (por exemplo 1e-4, a precisão típica do OSA em nm)
+    e contados da mesma forma. Se a faixa de valores for muito maior que o número de
+    amostras, ou se os dados não forem numéricos e finitos (NaN, inf, bool, texto),
+    a contagem é feita com `np.unique`.
+
     Parameters
     ----------
     data : numpy.ndarray or list
         Dados para os quais a PDF será calculada.
+    resolution : float or None, optional
+        Passo de quantização para dados de ponto flutuante. Com `None` (padrão), os
+        valores são comparados exatamente.
 
     Returns
     -------
     tuple of (numpy.ndarray, numpy.ndarray)
-        - Os valores únicos presentes nos dados.
+        - Os valores únicos presentes nos dados (quantizados, se `resolution` for informado).
         - A PDF correspondente a cada valor único.
 
     Example
@@ -373,9 +1307,44 @@ def find_pdf(data):
     >>> unique_values, pdf = find_pdf(data)
     >>> print(unique_values, pdf)
     [1 2 3] [0.16666667 0.33333333 0.5]
+    >>> unique_values, pdf = find_pdf(wl_res_list, resolution=1e-4)
     """
-    unique_values, counts = np.unique(data, return_counts=True)
+    data = np.ravel(data)
+    quantizado = data.dtype.kind == 'f' and resolution is not None
+    if quantizado:
+        with np.errstate(over='ignore', invalid='ignore'):
+            valores = np.round(data / resolution)
+    else:
+        valores = data
+
+    # Apenas inteiros e floats finitos de valor inteiro (após a quantização, se houver)
+    # seguem pela contagem direta; o restante (NaN/inf, bool, texto, ...) é contado
+    # com `np.unique` sobre os dados originais.
+    if valores.dtype.kind == 'f':
+        contagem_direta = bool(np.isfinite(valores).all()) and bool((valores == np.round(valores)).all())
+    else:
+        contagem_direta = valores.dtype.kind in 'iu'
+    if valores.size == 0 or not contagem_direta:
+        unique_values, counts = np.unique(data, return_counts=True)
+        return unique_values, counts / np.sum(counts)
+
+    v_min = valores.min()
+    # A faixa é avaliada fora do tipo dos dados, evitando overflow em int64/uint64.
+    if valores.dtype.kind == 'f':
+        faixa = float(valores.max()) - float(v_min)
+    else:
+        faixa = int(valores.max()) - int(v_min)
+    if faixa <= 4 * valores.size + 1024:
+        counts = np.bincount((valores - v_min).astype(np.intp))
+        unique_values = np.flatnonzero(counts)
+        counts = counts[unique_values]
+        unique_values = unique_values.astype(valores.dtype) + v_min
+    else:
+        unique_values, counts = np.unique(valores, return_counts=True)
+
     pdf = counts / np.sum(counts)
+    if quantizado:
+        unique_values = unique_values * resolution
     return unique_values, pdf
 
 
@@ -407,10 +1376,42 @@ def plot_histogram(data, ax=0):
     plt.grid(True)
     plt.show()
 
-def save_to_parquet(data, dia, sample, rodada, pasta_destino):
+def _tabela_parquet(data):
+    """
+    Converte os dados de `save_to_parquet` em uma tabela Arrow.
+
+    Listas de dicionários são convertidas coluna a coluna com `pa.Table.from_pydict`,
+    sem construir um DataFrame intermediário; as colunas são a união das chaves de
+    todos os dicionários e os tipos são inferidos sobre todas as linhas, com chaves
+    ausentes gravadas como nulas. Os demais dados passam por um DataFrame.
+
+    Parameters
+    ----------
+    data : list or pd.DataFrame
+        Dados a serem salvos.
+
+    Returns
+    -------
+    pyarrow.Table
+        Tabela com todos os dados.
+    """
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        colunas = dict.fromkeys(chave for linha in data for chave in linha)
+        return pa.Table.from_pydict({c: [linha.get(c) for linha in data] for c in colunas})
+    if isinstance(data, list):
+        data = pd.DataFrame(data)
+    return pa.Table.from_pandas(data)
+
+def save_to_parquet(data, dia, sample, rodada, pasta_destino, row_group_size=8192):
     """
     Salva os dados fornecidos em formato Parquet em um diretório especificado.
 
+    Os dados são convertidos em uma tabela Arrow e gravados em row groups de até
+    `row_group_size` linhas, comprimidos com ZSTD. A codificação por dicionário é
+    usada apenas nas colunas que não são de ponto flutuante. O arquivo é escrito
+    em um caminho temporário e só substitui o destino ao final, de modo que uma
+    falha não deixa um arquivo truncado nem apaga um arquivo salvo anteriormente.
+
     Parameters
     ----------
     data : list or pd.DataFrame
@@ -423,6 +1424,8 @@ def save_to_parquet(data, dia, sample, rodada, pasta_destino):
         Identificador da rodada.
     pasta_destino : str
         Caminho para o diretório onde o arquivo será salvo.
+    row_group_size : int, optional
+        Número máximo de linhas por row group (default: 8192).
 
     Returns
     -------
@@ -438,11 +1441,12 @@ def save_to_parquet(data, dia, sample, rodada, pasta_destino):
     nome_arquivo = f"dados_{dia}_{sample}_{rodada}.parquet"
     caminho_arquivo = os.path.join(pasta_destino, nome_arquivo)
     
-    if isinstance(data, list):
-        data = pd.DataFrame(data)
-    
     try:
-        data.to_parquet(caminho_arquivo, engine='pyarrow')
+        tbl = _tabela_parquet(data)
+        colunas_dicionario = [campo.name for campo in tbl.schema if not pa.types.is_floating(campo.type)]
+        with _escrita_atomica(caminho_arquivo) as caminho_tmp:
+            pq.write_table(tbl, caminho_tmp, row_group_size=row_group_size, compression='zstd',
+                           compression_level=3, use_dictionary=colunas_dicionario)
         print(f"Arquivo Parquet salvo com sucesso em: {caminho_arquivo}")
     except Exception as e:
         print(f"Erro ao salvar o arquivo {caminho_arquivo}: {e}")
@@ -465,6 +1469,10 @@ def save_to_json(data, nome_arquivo, pasta_destino):
     None
         Salva os dados em um arquivo JSON no diretório especificado.
 
+    Notes
+    -----
+    Com `orjson` instalado, valores NaN e ±inf são gravados como `null`.
+
     Example
     -------
     >>> data = pd.DataFrame({'A': [1, 2], 'B': [3, 4]})
@@ -477,8 +1485,7 @@ def save_to_json(data, nome_arquivo, pasta_destino):
         data = data.to_dict(orient="records")
     
     try:
-        with open(caminho_arquivo, "w") as f:
-            json.dump(data, f, indent=4)
+        _dump_json(data, caminho_arquivo)
         print(f"Arquivo JSON salvo com sucesso em: {caminho_arquivo}")
     except Exception as e:
         print(f"Erro ao salvar o arquivo {caminho_arquivo}: {e}")
\ No newline at end of file
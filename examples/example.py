@@ -4,7 +4,8 @@ from Sensorlytics import ler_multiplos_txt, varre_dados_plot
 diretorio = "path/to/your/directory"
 
 # Leia os arquivos .txt do diretório para criar os DataFrames
-dataframes = ler_multiplos_txt(diretorio)
+# (com cache=True, as execuções seguintes reaproveitam um cache Parquet no diretório)
+dataframes = ler_multiplos_txt(diretorio, cache=True)
 
 # Plote as franjas de visibilidade para os dados
 varre_dados_plot(dataframes, color='b')
\ No newline at end of file